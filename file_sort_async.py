@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+from file_sort_core import parse_args, process_and_move_files
+
+
+def main() -> None:
+    directory_path, move_files, rename_files_flag, use_cache = parse_args("file_sort_async.py")
+    process_and_move_files(directory_path, move_files, rename_files_flag, use_cache=use_cache, use_async=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,696 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import asyncio
+import hashlib
+import requests
+import mimetypes
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import orjson  # Optional: faster (de)serialization of API payloads
+except ImportError:
+    orjson = None
+try:
+    import httpx  # Optional: only needed for the asyncio mode of process_and_move_files
+except ImportError:
+    httpx = None
+import llm_cache
+from api_key import API_KEY  # Import API_KEY from the new file
+
+MODEL: str = "gemini-2.0-flash"
+API_URL: str = f"https://generativelanguage.googleapis.com/v1beta/models/{MODEL}:generateContent?key={API_KEY}"
+
+# (connect, read) timeouts in seconds for each LLM request
+REQUEST_TIMEOUT: tuple[int, int] = (5, 60)
+
+DEFAULT_WORKERS: int = 16
+
+
+def _workers_from_env() -> int:
+    """Read FS_WORKERS, falling back to DEFAULT_WORKERS if it is not a positive integer."""
+    value: str = os.environ.get("FS_WORKERS", str(DEFAULT_WORKERS))
+    try:
+        workers: int = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        print(f"Warning: FS_WORKERS={value!r} is not a positive integer, using {DEFAULT_WORKERS}")
+        return DEFAULT_WORKERS
+    return workers
+
+
+# Number of LLM requests kept in flight at the same time
+WORKERS: int = _workers_from_env()
+
+# Connections the asyncio client keeps open; with HTTP/2 most requests share a single one
+ASYNC_MAX_CONNECTIONS: int = 64
+
+# Retry policy for transient API errors; Retry-After from a 429 is honoured
+RETRY_TOTAL: int = 5
+RETRY_BACKOFF_FACTOR: float = 1.0
+RETRY_STATUSES: list[int] = [408, 429, 500, 502, 503, 504]
+# Longest Retry-After wait, in seconds, honoured by either client
+RETRY_AFTER_MAX: float = 60.0
+
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that waits at most RETRY_AFTER_MAX for a Retry-After header.
+
+    Overriding parse_retry_after works on every urllib3 version, unlike its
+    newer retry_after_max argument.
+    """
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), RETRY_AFTER_MAX)
+
+
+# One pooled session for all LLM calls so the TLS connection is kept alive
+SESSION: requests.Session = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=WORKERS,
+    max_retries=_CappedRetry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR,
+                            status_forcelist=RETRY_STATUSES, allowed_methods=["POST"],
+                            respect_retry_after_header=True)
+))
+
+SKIP_FILES: set[str] = {".DS_Store", ".localized",
+                        "Thumbs.db", "desktop.ini", ".gitignore", ".gitkeep"}
+
+# Fields the LLM can be asked to suggest for a file, in prompt order
+SUGGESTION_FIELDS: tuple[str, ...] = ("fileName", "folderName", "category")
+
+# Example answer and rules per field. The system instruction of a naming request
+# is built from the fields it asks for, so only the per-file details change
+# between requests of the same kind.
+FIELD_INSTRUCTIONS: Dict[str, tuple[str, str]] = {
+    "fileName": ('"fileName" : "correctFilename.ext"', """Filename
+    Please suggest a clear, descriptive filename that follows these rules:
+    - Keep the same file extension
+    - Use Upper case camel case
+    - if extension is PDF, it maybe a book title so use the official book title, and use spaced out words
+    - if it's an executable, try to see what software it is, then use that software name
+    - Be specific and descriptive about the content
+    - Maximum 50 characters (excluding extension)
+    - Return ONLY the new filename with no additional text or explanation
+    """),
+    "folderName": ('"folderName" : "Suggested Folder Name"', """Foldername
+     - Similar to a filename, except remove any file extensions for this name
+     - Do not show any versioning
+     - The words have to be separated by space
+     - If it's an application, just have the application, don't need to leave things like 'installer' or 'disk image' or "Mac/Windows" or "Application" etc
+    """),
+    "category": ('"category" : "Suggested Category"', """Category
+     - Suggest a category for the file based on its content, such as "Software", "Book", "Image", "Video", etc.
+     - Provide a single word or short phrase.
+    """)
+}
+
+# Number of bytes read from text files as a content preview for the LLM
+PREVIEW_BYTES: int = 1024
+
+# Categories that follow from the extension alone, without asking the LLM
+EXT_TO_CATEGORY: Dict[str, str] = {
+    ".pdf": "Books",
+    ".mp4": "Video", ".mkv": "Video",
+    ".mp3": "Music", ".flac": "Music",
+    ".jpg": "Images", ".jpeg": "Images", ".png": "Images",
+    ".zip": "Archives", ".tar": "Archives", ".gz": "Archives", ".7z": "Archives",
+    ".exe": "Software", ".msi": "Software", ".dmg": "Software", ".iso": "Software",
+    ".docx": "Documents", ".xlsx": "Documents", ".pptx": "Documents"
+}
+
+# mimetypes.guess_type() results memoized per file extension
+_MIME_TYPES_BY_EXTENSION: Dict[str, str] = {}
+
+
+def _guess_mime_type(extension: str) -> str:
+    """Guess the MIME type from a file extension, caching the answer per extension."""
+    mime_type: Optional[str] = _MIME_TYPES_BY_EXTENSION.get(extension)
+    if mime_type is None:
+        mime_type = mimetypes.guess_type(f"file{extension}")[0] or "unknown"
+        _MIME_TYPES_BY_EXTENSION[extension] = mime_type
+    return mime_type
+
+
+def _split_extension(name: str) -> str:
+    """Return the extension of a file name, with the same rules as Path.suffix."""
+    dot: int = name.rfind(".")
+    return name[dot:] if 0 < dot < len(name) - 1 else ""
+
+
+def _build_file_info(file_path: str, name: str, size_bytes: int) -> Dict[str, Any]:
+    """Assemble the classification info for a file whose name and size are already known."""
+    extension: str = _split_extension(name)
+    file_info: Dict[str, Any] = {
+        "name": name,
+        "extension": extension,
+        "size_bytes": size_bytes,
+        "mime_type": _guess_mime_type(extension)
+    }
+
+    # Try to extract a bit of content for non-empty text files
+    if file_info["mime_type"] and file_info["mime_type"].startswith("text/") and file_info["size_bytes"] > 0:
+        try:
+            with open(file_path, 'rb') as f:
+                raw: bytes = f.read(PREVIEW_BYTES)
+            file_info["preview"] = raw.decode('utf-8', errors='ignore')
+        except Exception as e:
+            file_info["preview"] = f"Error reading file content: {str(e)}"
+
+    return file_info
+
+
+def deterministic_mime_map(mime_type: Optional[str]) -> Optional[str]:
+    """Category implied by a MIME type, or None if the LLM has to decide."""
+    if mime_type and mime_type == "application/pdf":
+        return "Books"
+    elif mime_type and mime_type.startswith("application/"):
+        return "Software"
+    return None
+
+
+def deterministic_category(file_info: Dict[str, Any]) -> Optional[str]:
+    """Category implied by the file extension or MIME type, or None if the LLM has to decide."""
+    return EXT_TO_CATEGORY.get(file_info["extension"].lower()) or deterministic_mime_map(file_info["mime_type"])
+
+
+def get_file_info_from_entry(entry: os.DirEntry) -> Dict[str, Any]:
+    """Get basic information about a file that might be useful for classification.
+
+    Reuses the name and stat result os.scandir() already fetched.
+    """
+    return _build_file_info(entry.path, entry.name, entry.stat(follow_symlinks=False).st_size)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _extract_text(response_data: Any) -> Optional[str]:
+    """Return the text of the first candidate of a generateContent response.
+
+    Returns None for responses that do not have that shape, e.g. an empty parts list.
+    """
+    candidates = response_data.get("candidates") if isinstance(response_data, dict) else None
+    if isinstance(candidates, list) and len(candidates) > 0 and isinstance(candidates[0], dict):
+        content = candidates[0].get("content")
+        if isinstance(content, dict):
+            parts = content.get("parts")
+            if isinstance(parts, list) and len(parts) > 0 and isinstance(parts[0], dict):
+                text = parts[0].get("text")
+                if isinstance(text, str):
+                    return text.strip()
+
+    return None
+
+
+def _generate_text(payload: Dict[str, Any]) -> Optional[str]:
+    """Send a generateContent request and return the text of the first candidate."""
+    response: requests.Response = SESSION.post(
+        API_URL, data=_json_dumps(payload), headers={"Content-Type": "application/json"},
+        timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()  # Raise an exception for HTTP errors
+
+    return _extract_text(_json_loads(response.content))
+
+
+@lru_cache(maxsize=None)
+def _system_instructions(fields: tuple[str, ...]) -> str:
+    """System instruction asking for the given suggestion fields."""
+    examples: str = ",\n".join(
+        f"    {number}. {FIELD_INSTRUCTIONS[field][0]}" for number, field in enumerate(fields, 1))
+    rules: str = "\n".join(
+        f"    {number}. {FIELD_INSTRUCTIONS[field][1]}" for number, field in enumerate(fields, 1))
+    return f"""
+    I need suggestions for each file I describe.
+
+    Please provide the following for every file:
+{examples}
+
+{rules}"""
+
+
+@lru_cache(maxsize=None)
+def _batch_schema(fields: tuple[str, ...]) -> Dict[str, Any]:
+    """Response schema of a batch request asking for the given suggestion fields."""
+    return {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {"idx": {"type": "integer"}, **{field: {"type": "string"} for field in fields}},
+            "required": ["idx", *fields]
+        }
+    }
+
+
+def required_fields(file_info: Dict[str, Any], move_files: bool = False,
+                    rename_files: bool = False) -> tuple[str, ...]:
+    """Suggestion fields that process_and_move_files will actually use for a file.
+
+    Moving without renaming keeps the file name, renaming without moving needs no
+    folder, and the category is only asked for when a folder is used and the
+    extension does not already decide it. A dry run reports all of them.
+    """
+    dry_run: bool = not move_files and not rename_files
+    fields: list[str] = []
+    if rename_files or dry_run:
+        fields.append("fileName")
+    if move_files or dry_run:
+        fields.append("folderName")
+        if not deterministic_category(file_info):
+            fields.append("category")
+    return tuple(fields)
+
+
+def _build_payload(system_instructions: str, user_part: str,
+                   response_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a generateContent payload with the fixed instructions first and the per-file text last.
+
+    If response_schema is given, the model is constrained to answer with JSON matching it.
+    """
+    payload: Dict[str, Any] = {
+        "system_instruction": {
+            "parts": [{"text": system_instructions}]
+        },
+        "contents": [{
+            "parts": [{"text": user_part}]
+        }]
+    }
+    if response_schema is not None:
+        payload["generationConfig"] = {
+            "response_mime_type": "application/json",
+            "response_schema": response_schema
+        }
+    return payload
+
+
+def _file_descriptor(file_info: Dict[str, Any]) -> str:
+    """One-line description of a file, as sent to the LLM."""
+    return (f"name={file_info['name']} ext={file_info['extension']} mime={file_info['mime_type']} "
+            f"size={file_info['size_bytes']} preview={json.dumps(file_info.get('preview', ''))}")
+
+
+def _suggestion_key(file_info: Dict[str, Any], field: str) -> str:
+    """Cache key of one suggestion field of one file: SHA-256 of the model, field rules and file descriptor.
+
+    Files and fields are cached one by one, so an answer is reused whichever
+    batch or directory the file shows up in next time, and whichever other
+    fields the flags of that run ask for.
+    """
+    # Key on the stdlib serialization so it does not depend on whether orjson is installed
+    key_data: str = json.dumps([MODEL, field, FIELD_INSTRUCTIONS[field][1], _file_descriptor(file_info)])
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def _cached_suggestions(file_infos: list[Dict[str, Any]],
+                        fields: list[tuple[str, ...]]) -> list[Dict[str, Any]]:
+    """Look up the cached fields of every file; fields without a cached answer are left out."""
+    suggestions: list[Dict[str, Any]] = []
+    for file_info, file_fields in zip(file_infos, fields):
+        suggestion: Dict[str, Any] = {}
+        for field in file_fields:
+            cached: Optional[str] = llm_cache.get(_suggestion_key(file_info, field))
+            if cached:
+                suggestion[field] = cached
+        suggestions.append(suggestion)
+    return suggestions
+
+
+def _pending_fields(suggestions: list[Dict[str, Any]],
+                    fields: list[tuple[str, ...]]) -> list[tuple[str, ...]]:
+    """Fields of every file that still have to be asked from the LLM."""
+    return [tuple(field for field in file_fields if field not in suggestion)
+            for suggestion, file_fields in zip(suggestions, fields)]
+
+
+def _collect_batch_results(file_infos: list[Dict[str, Any]], batches: list[tuple[tuple[str, ...], list[int]]],
+                           batch_results: Any, suggestions: list[Dict[str, Any]],
+                           fields: list[tuple[str, ...]], use_cache: bool = True) -> None:
+    """Merge the answers of each batch into suggestions by file index, and store them in the cache.
+
+    Files that still miss one of their fields afterwards get an empty dict.
+    """
+    for (batch_fields, indices), batch_suggestions in zip(batches, batch_results):
+        for index, suggestion in zip(indices, batch_suggestions):
+            suggestions[index].update(suggestion)
+            if use_cache:
+                for field, value in suggestion.items():
+                    llm_cache.set(_suggestion_key(file_infos[index], field), value)
+
+    for index, file_fields in enumerate(fields):
+        if not all(field in suggestions[index] for field in file_fields):
+            suggestions[index] = {}
+
+
+def _build_batch_payload(batch: list[Dict[str, Any]],
+                         fields: tuple[str, ...] = SUGGESTION_FIELDS) -> Dict[str, Any]:
+    """Build the request payload asking for the given suggestion fields for all files in batch."""
+    file_lines: str = "\n".join(f"    [{i}] {_file_descriptor(info)}" for i, info in enumerate(batch))
+    example: str = ", ".join(['"idx" : 0', *(FIELD_INSTRUCTIONS[field][0] for field in fields)])
+    user_part: str = f"""
+{file_lines}
+
+    Please provide the answer as a json array with one object per file:
+    [{{{example}}}, ...]
+    where "idx" is the number in square brackets in front of the file.
+    """
+    return _build_payload(_system_instructions(fields), user_part, _batch_schema(fields))
+
+
+def _parse_batch_response(suggested_responses: Optional[str], batch_len: int,
+                          fields: tuple[str, ...] = SUGGESTION_FIELDS) -> list[Dict[str, Any]]:
+    """Map the LLM's json array back to the files of a batch by their idx.
+
+    Only answers that give a non-empty string for every requested field are
+    kept, reduced to those fields; other files get an empty dict.
+    """
+    suggestions: list[Dict[str, Any]] = [{} for _ in range(batch_len)]
+    if not suggested_responses:
+        return suggestions
+
+    try:
+        results = _json_loads(suggested_responses)
+    except json.JSONDecodeError as e:
+        print(f"Error parsing LLM batch response: {str(e)}")
+        return suggestions
+
+    for result in results if isinstance(results, list) else []:
+        if not isinstance(result, dict):
+            continue
+        idx = result.get("idx")
+        if not isinstance(idx, int) or not 0 <= idx < batch_len:
+            continue
+        if all(isinstance(result.get(field), str) and result[field].strip() for field in fields):
+            suggestions[idx] = {field: result[field] for field in fields}
+
+    return suggestions
+
+
+def _make_batches(file_infos: list[Dict[str, Any]], batch_size: int,
+                  fields: Optional[list[tuple[str, ...]]]) -> list[tuple[tuple[str, ...], list[int]]]:
+    """Group file indices into batches of at most batch_size files that ask for the same fields."""
+    groups: Dict[tuple[str, ...], list[int]] = {}
+    for index, file_fields in enumerate(fields or [SUGGESTION_FIELDS] * len(file_infos)):
+        if file_fields:
+            groups.setdefault(file_fields, []).append(index)
+    return [
+        (file_fields, indices[start:start + batch_size])
+        for file_fields, indices in groups.items()
+        for start in range(0, len(indices), batch_size)
+    ]
+
+
+def _suggest_names_chunk(batch: list[Dict[str, Any]],
+                         fields: tuple[str, ...] = SUGGESTION_FIELDS) -> list[Dict[str, Any]]:
+    """Ask the LLM for the given suggestion fields of all files in batch with one request."""
+    try:
+        suggested_responses: Optional[str] = _generate_text(_build_batch_payload(batch, fields))
+    except requests.exceptions.RequestException as e:
+        print(f"Error calling LLM API: {str(e)}")
+        suggested_responses = None
+    except ValueError as e:  # The API answered with something that is not JSON
+        print(f"Error parsing LLM API response: {str(e)}")
+        suggested_responses = None
+
+    return _parse_batch_response(suggested_responses, len(batch), fields)
+
+
+def suggest_names_batch(file_infos: list[Dict[str, Any]], batch_size: int = 16,
+                        max_workers: int = WORKERS, use_cache: bool = True,
+                        fields: Optional[list[tuple[str, ...]]] = None) -> list[Dict[str, Any]]:
+    """Ask the LLM for filename, folder name and category of several files per request.
+
+    fields optionally lists the suggestion fields to ask for, per file; files
+    with no fields are not sent at all. With use_cache, only the fields that
+    have no cached answer yet are asked for. Up to max_workers requests
+    run concurrently. Returns one suggestion dict per entry of file_infos, in
+    the same order. Files the LLM gave no usable answer for get an empty dict.
+    """
+    fields = fields or [SUGGESTION_FIELDS] * len(file_infos)
+    suggestions: list[Dict[str, Any]] = (_cached_suggestions(file_infos, fields) if use_cache
+                                         else [{} for _ in file_infos])
+    pending: list[tuple[str, ...]] = _pending_fields(suggestions, fields)
+    batches: list[tuple[tuple[str, ...], list[int]]] = _make_batches(file_infos, batch_size, pending)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        batch_results = executor.map(
+            _suggest_names_chunk,
+            [[file_infos[index] for index in indices] for _, indices in batches],
+            [batch_fields for batch_fields, _ in batches])
+        _collect_batch_results(file_infos, batches, batch_results, suggestions, fields, use_cache)
+    return suggestions
+
+
+def _retry_delay(response: Optional["httpx.Response"], attempt: int) -> float:
+    """Seconds to wait before retrying: the Retry-After header if given, else exponential backoff.
+
+    Like urllib3, Retry-After is only honoured on 413/429/503 responses and may be
+    given in seconds or as an HTTP date. It is capped at RETRY_AFTER_MAX. Pass
+    None for failures without a response.
+    """
+    retry_after: Optional[str] = None
+    if response is not None and response.status_code in Retry.RETRY_AFTER_STATUS_CODES:
+        retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        seconds: Optional[float] = None
+        if retry_after.strip().isdigit():
+            seconds = float(retry_after)
+        else:
+            try:
+                retry_at: datetime = parsedate_to_datetime(retry_after)
+                now: datetime = datetime.now(retry_at.tzinfo) if retry_at.tzinfo else datetime.now()
+                seconds = max(0.0, (retry_at - now).total_seconds())
+            except (TypeError, ValueError):
+                pass
+        if seconds is not None:
+            return min(seconds, RETRY_AFTER_MAX)
+    return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+
+async def _generate_text_async(client: "httpx.AsyncClient", payload: Dict[str, Any]) -> Optional[str]:
+    """Async version of _generate_text."""
+    # Same retry policy as the requests SESSION, which httpx does not provide itself:
+    # connection errors, timeouts and the RETRY_STATUSES are retried
+    for attempt in range(RETRY_TOTAL + 1):
+        try:
+            response: httpx.Response = await client.post(
+                API_URL, content=_json_dumps(payload), headers={"Content-Type": "application/json"})
+        except httpx.TransportError:
+            if attempt == RETRY_TOTAL:
+                raise
+            await asyncio.sleep(_retry_delay(None, attempt))
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+            break
+        await asyncio.sleep(_retry_delay(response, attempt))
+    response.raise_for_status()  # Raise an exception for HTTP errors
+
+    return _extract_text(_json_loads(response.content))
+
+
+async def classify_batch(client: "httpx.AsyncClient", semaphore: asyncio.Semaphore,
+                         batch: list[Dict[str, Any]],
+                         fields: tuple[str, ...] = SUGGESTION_FIELDS) -> list[Dict[str, Any]]:
+    """Async version of _suggest_names_chunk, waiting on semaphore before sending the request."""
+    async with semaphore:
+        try:
+            suggested_responses: Optional[str] = await _generate_text_async(
+                client, _build_batch_payload(batch, fields))
+        except httpx.HTTPError as e:
+            print(f"Error calling LLM API: {str(e)}")
+            suggested_responses = None
+        except ValueError as e:  # The API answered with something that is not JSON
+            print(f"Error parsing LLM API response: {str(e)}")
+            suggested_responses = None
+
+    return _parse_batch_response(suggested_responses, len(batch), fields)
+
+
+async def suggest_names_batch_async(file_infos: list[Dict[str, Any]], batch_size: int = 16,
+                                    concurrency: int = WORKERS, use_cache: bool = True,
+                                    fields: Optional[list[tuple[str, ...]]] = None) -> list[Dict[str, Any]]:
+    """Async version of suggest_names_batch.
+
+    All batches are sent over one HTTP/2 client, with at most concurrency
+    requests in flight at a time.
+    """
+    fields = fields or [SUGGESTION_FIELDS] * len(file_infos)
+    suggestions: list[Dict[str, Any]] = (_cached_suggestions(file_infos, fields) if use_cache
+                                         else [{} for _ in file_infos])
+    pending: list[tuple[str, ...]] = _pending_fields(suggestions, fields)
+    batches: list[tuple[tuple[str, ...], list[int]]] = _make_batches(file_infos, batch_size, pending)
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(max(1, concurrency))
+    limits: httpx.Limits = httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS,
+                                        max_keepalive_connections=ASYNC_MAX_CONNECTIONS)
+    timeout: httpx.Timeout = httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=timeout) as client:
+        results: list[list[Dict[str, Any]]] = await asyncio.gather(
+            *(classify_batch(client, semaphore, [file_infos[index] for index in indices], batch_fields)
+              for batch_fields, indices in batches))
+
+    _collect_batch_results(file_infos, batches, results, suggestions, fields, use_cache)
+    return suggestions
+
+
+def apply_decision(directory: Path, file_path: Path, file_info: Dict[str, Any], data: Dict[str, Any],
+                   move_files: bool = False, rename_files: bool = False,
+                   created_dirs: Optional[set[Path]] = None) -> None:
+    """Move and/or rename a single file according to the LLM suggestion (or just report it).
+
+    created_dirs holds the target folders already created in this run, so each
+    folder is only created once when many files go into it.
+    """
+    abs_str: str = str(file_path)
+    try:
+        # Fields that were not asked for (see required_fields) fall back to the current name
+        file_name = data.get("fileName") or file_path.name
+        folder_name = data.get("folderName") or file_path.stem
+
+        # Determine category folder based on file type or the LLM suggestion
+        category_folder = (deterministic_category(file_info)
+                           or str(data.get("category") or "").strip().capitalize()
+                           or "Uncategorized")
+
+        if move_files or rename_files:
+            # Determine the target path based on flags
+            if move_files:
+                # Create the target folder
+                target_folder: Path = directory / category_folder / folder_name
+                if created_dirs is None or target_folder not in created_dirs:
+                    target_folder.mkdir(parents=True, exist_ok=True)
+                    if created_dirs is not None:
+                        created_dirs.add(target_folder)
+
+                # Determine file name based on whether we're renaming
+                target_filename = file_name if rename_files else file_path.name
+                new_path = target_folder / target_filename
+                os.rename(file_path, new_path)
+
+                if rename_files:
+                    print(f"✓ Moved and renamed '{abs_str}' to '{new_path}'")
+                else:
+                    print(f"✓ Moved '{abs_str}' to '{new_path}'")
+            else:  # Only rename_files is True
+                new_path = file_path.parent / file_name
+                os.rename(file_path, new_path)
+                print(f"✓ Renamed '{abs_str}' to '{new_path}'")
+        else:
+            # Dry run - just show what would happen
+            if rename_files and move_files:
+                print(f"Would move and rename '{abs_str}' to '{directory / category_folder / folder_name / file_name}'")
+            elif move_files:
+                print(f"Would move '{abs_str}' to '{directory / category_folder / folder_name / file_path.name}'")
+            elif rename_files:
+                print(f"Would rename '{abs_str}' to '{file_path.parent / file_name}'")
+            else:
+                print(f"Would process '{abs_str}'")
+                print(f"Suggested new filename: '{file_name}'")
+                print(f"Suggested folder: '{folder_name}'")
+                print(f"Suggested category: '{category_folder}'")
+    except (OSError, KeyError, TypeError) as e:
+        print(f"Error processing file '{abs_str}': {str(e)}")
+
+
+def scan_directory(directory: Path) -> tuple[list[Path], list[Dict[str, Any]]]:
+    """List the files of directory that should be classified, together with their file info.
+
+    Pass an absolute directory so the returned paths are absolute as well.
+    """
+    files: list[Path] = []
+    file_infos: list[Dict[str, Any]] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                if entry.name in SKIP_FILES:
+                    print(f"Skipping file: {entry.path}")
+                    continue
+                files.append(Path(entry.path))
+                file_infos.append(get_file_info_from_entry(entry))
+    return files, file_infos
+
+
+def apply_suggestions(directory: Path, files: list[Path], file_infos: list[Dict[str, Any]],
+                      suggestions: list[Dict[str, Any]], move_files: bool = False,
+                      rename_files: bool = False) -> None:
+    """Apply (or report) the LLM suggestions for each scanned file, in order."""
+    created_dirs: set[Path] = set()
+    for file_path, file_info, data in zip(files, file_infos, suggestions):
+        print(f"\nProcessing file: {file_path}")
+
+        if data:
+            apply_decision(directory, file_path, file_info, data, move_files, rename_files, created_dirs)
+        else:
+            print(f"Couldn't get suggestions for: {file_path}")
+
+
+def process_and_move_files(directory_path: str, move_files: bool = False, rename_files: bool = False,
+                           batch_size: int = 16, use_cache: bool = True, use_async: bool = False) -> None:
+    """Process all files in the given directory and organize based on flags.
+    --move-files: Create folders and move files (without renaming)
+    --rename-files: Rename files (without moving unless --move-files is also specified)
+    Files are sent to the LLM in batches of batch_size per request, with up to
+    FS_WORKERS (default 16) requests in flight. Files are moved on the calling thread.
+    use_cache: Reuse cached LLM responses (turned off by --no-cache)
+    use_async: Send the requests with asyncio and httpx instead of a thread pool
+    """
+    directory: Path = Path(directory_path).absolute()
+
+    if not directory.exists() or not directory.is_dir():
+        print(f"Error: {directory_path} is not a valid directory")
+        return
+
+    # httpx only supports http2=True when the h2 package is installed as well
+    if use_async and (httpx is None or importlib.util.find_spec("h2") is None):
+        print('Error: asyncio mode needs httpx, install it with: pip install "httpx[http2]"')
+        return
+
+    files, file_infos = scan_directory(directory)
+
+    # Get suggestions from LLM, several files per request,
+    # asking only for the fields the chosen flags use
+    fields: list[tuple[str, ...]] = [required_fields(file_info, move_files, rename_files) for file_info in file_infos]
+    suggestions: list[Dict[str, Any]]
+    if use_async:
+        suggestions = asyncio.run(suggest_names_batch_async(file_infos, batch_size, use_cache=use_cache,
+                                                            fields=fields))
+    else:
+        suggestions = suggest_names_batch(file_infos, batch_size, use_cache=use_cache, fields=fields)
+
+    apply_suggestions(directory, files, file_infos, suggestions, move_files, rename_files)
+
+
+def parse_args(script_name: str) -> tuple[str, bool, bool, bool]:
+    """Parse sys.argv into (directory_path, move_files, rename_files, use_cache), or print usage and exit."""
+    if len(sys.argv) < 2:
+        print(f"Usage: python {script_name} <directory_path> [--move-files] [--rename-files] [--no-cache]")
+        print("  --move-files: Move files to organized folders (preserves original filenames)")
+        print("  --rename-files: Rename files with better names (keeps files in place unless --move-files is specified)")
+        print("  --no-cache: Ignore cached LLM responses and always call the API")
+        sys.exit(1)
+    directory_path: str = sys.argv[1]
+    move_files: bool = any("--move-files" in arg for arg in sys.argv)
+    rename_files_flag: bool = any("--rename-files" in arg for arg in sys.argv)
+    use_cache: bool = not any("--no-cache" in arg for arg in sys.argv)
+
+    print(f"Running with flags: move_files={move_files}, rename_files={rename_files_flag}, use_cache={use_cache}")
+
+    return directory_path, move_files, rename_files_flag, use_cache
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Optional
+
+# One small JSON file per cached suggestion value
+CACHE_DIR: Path = Path.home() / ".cache" / "file_sort"
+
+
+def _cache_path(key: str) -> Path:
+    """Location of the cache entry for a key, sharded by its first two characters."""
+    return CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached suggestion value for key, or None if there is none."""
+    try:
+        with open(_cache_path(key), 'r', encoding='utf-8') as f:
+            value = json.load(f)["value"]
+        return value if isinstance(value, str) else None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def set(key: str, value: str) -> None:
+    """Store the suggestion value for key. Write failures are reported, not raised."""
+    path: Path = _cache_path(key)
+    tmp_path: Path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"value": value}, f)
+        # Replace atomically so concurrent workers never see a partial entry
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error writing LLM cache entry: {str(e)}")